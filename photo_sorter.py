@@ -1,11 +1,21 @@
+import errno
+import io
 import os
 import shutil
+import struct
 from datetime import datetime
 import logging
 import sys
-from typing import Optional, List
+from typing import Optional, Dict, Iterable, List, Set, Tuple, Iterator, Union
 import logging.handlers
 import glob
+import hashlib
+import contextlib
+import multiprocessing
+import sqlite3
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import exifread
@@ -17,9 +27,6 @@ except ImportError:
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 LOGS_DIR = os.path.join(SCRIPT_DIR, 'logs')
 
-# Create logs directory if it doesn't exist
-os.makedirs(LOGS_DIR, exist_ok=True)
-
 # Dynamically determine current home directory
 HOME_DIR = os.path.expanduser("~")
 
@@ -30,16 +37,67 @@ SOURCE_FOLDERS = [
 ]
 PHOTOS_BASE = os.path.join(HOME_DIR, 'Photos')
 
+# Cache of already extracted dates, keyed by inode
+CACHE_DIR = os.path.join(HOME_DIR, '.cache', 'photo_sorter')
+CACHE_FILE = os.path.join(CACHE_DIR, 'exif.sqlite3')
+
 # File extensions for different types of images/videos
 MEDIA_EXTS = {'jpg', 'jpeg', 'png', 'heic', 'mov', 'mp4', 'gif', 'avi', 'mpg', 'mpeg',
               'cr2', 'cr3', 'nef', 'arw', 'dng', 'raf', 'rw2'}
 
+# Media formats exifread cannot read, their date always comes from the modification time
+NO_EXIF_EXTS = {'mov', 'mp4', 'gif', 'avi', 'mpg', 'mpeg', 'cr3', 'raf'}
+
+# Formats whose EXIF block can lie beyond the header, worth a full-file parse
+FULL_PARSE_EXTS = {'jpg', 'jpeg', 'heic', 'cr2', 'nef', 'arw', 'dng', 'rw2'}
+
+# Lowercase file name suffixes of media files, for str.endswith
+_MEDIA_SUFFIXES = tuple(sorted('.' + ext for ext in MEDIA_EXTS))
+
+# Number of bytes read from the start of a file when looking for EXIF data
+EXIF_HEADER_SIZE = 65536
+
+# Files smaller than this cannot contain a useful EXIF block
+MIN_EXIF_FILE_SIZE = 256
+
+# Number of files handed to a pool worker at once, and number of header reads
+# each worker keeps in flight to hide NAS latency
+DATE_BATCH_SIZE = 64
+HEADER_READ_THREADS = 16
+
+# Runs with fewer files than this extract dates in the main process instead of
+# paying for a process pool
+POOL_THRESHOLD = 500
+
+# Pool workers are started by a fork server: forking the main process itself is
+# unsafe once the logging and mover threads are running
+_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+# Maximum number of dated files waiting for the mover thread
+MOVE_QUEUE_SIZE = 64
+
+# Seconds to wait on a full move queue before checking the mover thread is alive
+MOVE_PUT_TIMEOUT = 1
+
+# Destination directories already created by this process
+_created_dirs: Set[str] = set()
+
+# Destination folder for each day, keyed by the day's ordinal and built once per day
+_date_folders: Dict[int, str] = {}
+
+# Chunk size used when hashing files to detect duplicates
+HASH_CHUNK_SIZE = 1024 * 1024
+
 # Synology specific directories to exclude
 EXCLUDE_DIRS = {'@eaDir'}
 
 # System files to ignore when checking if directory is empty
 IGNORE_FILES = {'Thumbs.db', '.DS_Store', '@eaDir'}
 
+# Name prefixes of system files, for str.startswith
+_IGNORE_PREFIXES = tuple(sorted(IGNORE_FILES))
+
 def cleanup_old_logs(max_logs: int = 30):
     """
     Clean up old log files, keeping only the most recent ones.
@@ -57,155 +115,727 @@ def cleanup_old_logs(max_logs: int = 30):
         except Exception as e:
             print(f"Failed to remove old log file {old_log}: {e}")
 
-# Configure logging to output to both file and console
+# Routine records (e.g. every moved file) are only logged when asked for
+VERBOSE = '--verbose' in sys.argv[1:] or bool(os.environ.get('PHOTO_SORTER_VERBOSE'))
+
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
 
-# Create a new log file with timestamp
-timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-log_file = os.path.join(LOGS_DIR, f'photo_sorter_{timestamp}.log')
+def setup_logging() -> None:
+    """
+    Configure logging to a new timestamped log file and, on interactive or
+    verbose runs, the console. Old log files are cleaned up.
+    Only called by main, so that pool workers importing this module do not
+    create log files of their own.
+    """
+    # Create logs directory if it doesn't exist
+    os.makedirs(LOGS_DIR, exist_ok=True)
+
+    # Log to console only on interactive or verbose runs
+    log_to_console = VERBOSE or sys.stdout.isatty()
+    logger.setLevel(logging.INFO if log_to_console else logging.WARNING)
+
+    # Create a new log file with timestamp
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_file = os.path.join(LOGS_DIR, f'photo_sorter_{timestamp}.log')
+
+    # File handler
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    file_handler.setLevel(logging.INFO if VERBOSE else logging.WARNING)
+    logger.addHandler(file_handler)
+
+    # Console handler
+    if log_to_console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(console_handler)
+
+    # Clean up old logs
+    cleanup_old_logs()
+
+def _ifd_value(tiff: bytes, endian: str, ifd_offset: int, tag: int) -> Optional[Tuple[int, int]]:
+    """
+    Find a tag in a TIFF IFD.
+
+    Args:
+        tiff: TIFF data, starting at the byte order mark
+        endian: struct byte order prefix of the TIFF data
+        ifd_offset: Offset of the IFD within the TIFF data
+        tag: Tag number to look for
+
+    Returns:
+        Tuple of (count, value/offset field) if the tag is present, None otherwise
+    """
+    count, = struct.unpack_from(endian + 'H', tiff, ifd_offset)
+    for i in range(count):
+        entry_tag, _, value_count, value = struct.unpack_from(endian + 'HHII', tiff, ifd_offset + 2 + i * 12)
+        if entry_tag == tag:
+            return value_count, value
+    return None
+
+def _tiff_datetime(tiff: bytes) -> Optional[datetime]:
+    """
+    Read DateTimeOriginal from TIFF structured EXIF data without decoding any other tag.
+
+    Args:
+        tiff: TIFF data, starting at the byte order mark
+
+    Returns:
+        datetime object if the tag is present, None otherwise
+    """
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return None
+    magic, ifd0_offset = struct.unpack_from(endian + 'HI', tiff, 2)
+    if magic != 42:
+        return None
+
+    exif_ifd = _ifd_value(tiff, endian, ifd0_offset, 0x8769)  # ExifOffset
+    if not exif_ifd:
+        return None
+    date_taken = _ifd_value(tiff, endian, exif_ifd[1], 0x9003)  # DateTimeOriginal
+    if not date_taken or date_taken[0] < 19:
+        return None
+    value = tiff[date_taken[1]:date_taken[1] + 19].decode('ascii')
+    return datetime.strptime(value, '%Y:%m:%d %H:%M:%S')
+
+def _fast_datetime(buf: bytes) -> Optional[datetime]:
+    """
+    Read DateTimeOriginal from the APP1 segment of a JPEG header, which is much
+    faster than a full exifread parse.
+
+    Args:
+        buf: Start of the file
+
+    Returns:
+        datetime object if the tag was found, None if the data is not a JPEG
+        or the tag could not be read
+    """
+    if buf[:2] != b'\xff\xd8':
+        return None
+    try:
+        pos = 2
+        while pos + 4 <= len(buf):
+            if buf[pos] != 0xFF:
+                return None
+            marker = buf[pos + 1]
+            if marker == 0xFF:
+                # Fill byte
+                pos += 1
+                continue
+            if marker in (0xD9, 0xDA):
+                # End of image or start of scan, no metadata follows
+                return None
+            length, = struct.unpack_from('>H', buf, pos + 2)
+            if marker == 0xE1 and buf[pos + 4:pos + 10] == b'Exif\0\0':
+                return _tiff_datetime(buf[pos + 10:pos + 2 + length])
+            pos += 2 + length
+    except (struct.error, UnicodeDecodeError, ValueError):
+        pass
+    return None
+
+def _tiff_fast_datetime(buf: bytes) -> Optional[datetime]:
+    """
+    Read DateTimeOriginal from the header of a TIFF based RAW file (CR2, NEF, ARW, DNG).
+
+    Args:
+        buf: Start of the file
+
+    Returns:
+        datetime object if the tag was found, None otherwise
+    """
+    try:
+        return _tiff_datetime(buf)
+    except (struct.error, UnicodeDecodeError, ValueError):
+        return None
 
-# File handler
-file_handler = logging.FileHandler(log_file)
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
+# Dedicated header parser per extension, other formats are read with exifread
+_HEADER_PARSERS = {ext: _fast_datetime for ext in ('jpg', 'jpeg')}
+_HEADER_PARSERS.update({ext: _tiff_fast_datetime for ext in ('cr2', 'nef', 'arw', 'dng')})
 
-# Console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(logging.Formatter('%(message)s'))
-logger.addHandler(console_handler)
+def _exif_date(f) -> Optional[datetime]:
+    """
+    Read the EXIF DateTimeOriginal tag from a file object.
 
-# Clean up old logs
-cleanup_old_logs()
+    Args:
+        f: Binary file object positioned at the start of the media data
 
-def get_date_taken(path: str) -> Optional[datetime]:
+    Returns:
+        datetime object if the tag is present, None otherwise
+    """
+    tags = exifread.process_file(f, stop_tag='DateTimeOriginal', details=False)
+    date_taken = tags.get('EXIF DateTimeOriginal')
+    if date_taken:
+        return datetime.strptime(str(date_taken), '%Y:%m:%d %H:%M:%S')
+    return None
+
+def _read_header(path: str) -> bytes:
+    """
+    Read the first EXIF_HEADER_SIZE bytes of a file.
+
+    Args:
+        path: Path to the media file
+
+    Returns:
+        Header bytes
+    """
+    with open(path, 'rb') as f:
+        return f.read(EXIF_HEADER_SIZE)
+
+def _prefetch_header(path: str, st: os.stat_result) -> Optional[bytes]:
+    """
+    Read the header of a file, leaving error reporting to get_date_taken.
+
+    Args:
+        path: Path to the media file
+        st: Stat result of the file
+
+    Returns:
+        Header bytes, or None if the file could not be read or has no readable EXIF data
+    """
+    if st.st_size < MIN_EXIF_FILE_SIZE or path.rpartition('.')[2].lower() in NO_EXIF_EXTS:
+        return None
+    try:
+        return _read_header(path)
+    except OSError:
+        return None
+
+def get_date_taken(entry: Union[str, os.DirEntry],
+                   st: Optional[os.stat_result] = None,
+                   header: Optional[bytes] = None) -> Optional[datetime]:
     """
     Extract the date when the photo/video was taken.
     First tries to read EXIF data, falls back to file modification time if EXIF is not available.
+    The file is stat'ed once up front; files too small to contain EXIF data and files
+    whose EXIF data cannot be read use the modification time from that stat result.
+    EXIF data is looked up in the first EXIF_HEADER_SIZE bytes of the file, the whole
+    file is only parsed if the tag is not found there and the format can store it
+    further in. Formats exifread cannot read are not opened. JPEG and TIFF based RAW headers
+    are read with a dedicated parser, other formats with exifread.
 
     Args:
-        path: Path to the media file
+        entry: Path or directory entry of the media file
+        st: Stat result of the file if already known
+        header: First EXIF_HEADER_SIZE bytes of the file if already read
 
     Returns:
         datetime object if date could be determined, None otherwise
     """
+    path = os.fspath(entry)
+    if st is None:
+        try:
+            st = entry.stat() if isinstance(entry, os.DirEntry) else os.stat(path)
+        except OSError as e:
+            logger.error(f"Failed to read file modification date for {path}: {e}")
+            return None
+
+    if st.st_size < MIN_EXIF_FILE_SIZE:
+        return datetime.fromtimestamp(st.st_mtime)
+
+    ext = path.rpartition('.')[2].lower()
+    if ext in NO_EXIF_EXTS:
+        return datetime.fromtimestamp(st.st_mtime)
+
     try:
-        with open(path, 'rb') as f:
-            tags = exifread.process_file(f, stop_tag='DateTimeOriginal', details=False)
-            date_taken = tags.get('EXIF DateTimeOriginal')
-            if date_taken:
-                return datetime.strptime(str(date_taken), '%Y:%m:%d %H:%M:%S')
+        if header is None:
+            header = _read_header(path)
+        parser = _HEADER_PARSERS.get(ext)
+        date_taken = parser(header) if parser else None
+        if not date_taken:
+            # No dedicated parser (PNG/HEIC/...) or an unusual layout, use exifread
+            try:
+                date_taken = _exif_date(io.BytesIO(header))
+            except Exception:
+                date_taken = None
+
+        if not date_taken and ext in FULL_PARSE_EXTS and len(header) == EXIF_HEADER_SIZE:
+            # The EXIF block is not in the header, parse the whole file
+            with open(path, 'rb') as f:
+                date_taken = _exif_date(f)
+
+        if date_taken:
+            return date_taken
     except Exception as e:
         logger.warning(f"Failed to read EXIF data for {path}: {e}")
 
+    return datetime.fromtimestamp(st.st_mtime)
+
+def open_date_cache(path: str = CACHE_FILE) -> sqlite3.Connection:
+    """
+    Open (and create if needed) the cache of extracted dates.
+
+    Args:
+        path: Path to the sqlite database
+
+    Returns:
+        Connection to the cache database
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cache = sqlite3.connect(path)
+    cache.execute('PRAGMA journal_mode=WAL')
+    cache.execute('PRAGMA synchronous=NORMAL')
+    cache.execute('CREATE TABLE IF NOT EXISTS dates ('
+                  'dev INTEGER, ino INTEGER, mtime REAL, size INTEGER, dt TEXT, '
+                  'PRIMARY KEY (dev, ino))')
+    return cache
+
+def get_cached_date(cache: sqlite3.Connection, st: os.stat_result) -> Optional[datetime]:
+    """
+    Look up the date of a file in the cache. An entry is only valid if the file
+    has not been modified since it was stored.
+
+    Args:
+        cache: Connection returned by open_date_cache
+        st: Stat result of the file
+
+    Returns:
+        Cached datetime if present and still valid, None otherwise
+    """
+    row = cache.execute('SELECT dt FROM dates WHERE dev = ? AND ino = ? AND mtime = ? AND size = ?',
+                        (st.st_dev, st.st_ino, st.st_mtime, st.st_size)).fetchone()
+    return datetime.fromisoformat(row[0]) if row else None
+
+def store_cached_date(cache: sqlite3.Connection, st: os.stat_result, date_taken: datetime) -> None:
+    """
+    Store the date of a file in the cache.
+
+    Args:
+        cache: Connection returned by open_date_cache
+        st: Stat result of the file
+        date_taken: Date extracted for the file
+    """
+    cache.execute('INSERT OR REPLACE INTO dates VALUES (?, ?, ?, ?, ?)',
+                  (st.st_dev, st.st_ino, st.st_mtime, st.st_size, date_taken.isoformat()))
+
+def delete_cached_date(cache: sqlite3.Connection, st: os.stat_result) -> None:
+    """
+    Remove the date of a file from the cache.
+
+    Args:
+        cache: Connection returned by open_date_cache
+        st: Stat result of the file
+    """
+    cache.execute('DELETE FROM dates WHERE dev = ? AND ino = ?', (st.st_dev, st.st_ino))
+
+def _reserve_path(path: str) -> bool:
+    """
+    Atomically reserve a destination path by creating an empty placeholder file.
+
+    Args:
+        path: Destination file path
+
+    Returns:
+        True if the path was reserved, False if it already exists
+    """
     try:
-        mtime = os.path.getmtime(path)
-        return datetime.fromtimestamp(mtime)
-    except Exception as e:
-        logger.error(f"Failed to read file modification date for {path}: {e}")
-        return None
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    return True
 
-def move_file(src: str, dest: str) -> None:
+def _file_digest(path: str) -> bytes:
+    """
+    Compute the SHA-256 digest of a file's content.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Digest bytes
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.digest()
+
+def move_file(src: str, dest: str, same_device: bool = False) -> None:
     """
     Move a file to destination, handling filename conflicts by adding a counter.
+    The destination name is reserved with O_CREAT|O_EXCL before moving, so a
+    conflicting file can never be overwritten. If a conflicting file has the
+    same content as the source, the source is deleted instead of moved.
 
     Args:
         src: Source file path
         dest: Destination directory path
+        same_device: Whether source and destination are known to be on the same
+            filesystem, in which case the file is renamed directly
     """
-    os.makedirs(dest, exist_ok=True)
+    if dest not in _created_dirs:
+        os.makedirs(dest, exist_ok=True)
+        _created_dirs.add(dest)
     dest_path = os.path.join(dest, os.path.basename(src))
 
-    if os.path.exists(dest_path):
+    if not _reserve_path(dest_path):
         base, ext = os.path.splitext(os.path.basename(src))
-        counter = 1
+        src_size = os.path.getsize(src)
+        src_digest = None
+        counter = 0
         while True:
-            new_name = f"{base}_{counter}{ext}"
-            new_dest_path = os.path.join(dest, new_name)
-            if not os.path.exists(new_dest_path):
-                dest_path = new_dest_path
-                break
+            # Only hash when the sizes match
+            if os.path.getsize(dest_path) == src_size:
+                if src_digest is None:
+                    src_digest = _file_digest(src)
+                if _file_digest(dest_path) == src_digest:
+                    os.remove(src)
+                    logger.info(f"Removed duplicate: {src} (same as {dest_path})")
+                    return
+
             counter += 1
+            dest_path = os.path.join(dest, f"{base}_{counter}{ext}")
+            if _reserve_path(dest_path):
+                break
 
-    shutil.move(src, dest_path)
+    try:
+        if same_device:
+            try:
+                os.replace(src, dest_path)
+            except OSError as e:
+                # A subfolder or day folder may still be on another filesystem
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(src, dest_path)
+        else:
+            shutil.move(src, dest_path)
+    except Exception:
+        # Release the reserved name
+        os.remove(dest_path)
+        raise
     logger.info(f"Moved: {src} -> {dest_path}")
 
-def remove_empty_dirs(path: str) -> None:
+def _is_system_file(name: str) -> bool:
     """
-    Remove empty directories recursively from bottom up.
+    Check whether a directory entry is a system file that does not keep a directory alive.
+
+    Args:
+        name: File or directory name
+
+    Returns:
+        True if the entry is ignored when checking if a directory is empty
+    """
+    return name.startswith(_IGNORE_PREFIXES)
+
+def remove_empty_dirs(candidates: Iterable[str]) -> None:
+    """
+    Remove empty directories from bottom up.
     Directories containing only system files (Thumbs.db, .DS_Store) or @eaDir
     are considered empty.
     
     Args:
-        path: Starting path to check for empty directories
+        candidates: Directories that may have become empty, collected during the walk
     """
-    for root, dirs, files in os.walk(path, topdown=False):
-        for dir_name in dirs:
-            dir_path = os.path.join(root, dir_name)
-            try:
-                # Get directory contents, excluding system files
-                contents = [f for f in os.listdir(dir_path) 
-                          if f not in IGNORE_FILES and 
-                          not any(f.startswith(ignore) for ignore in IGNORE_FILES)]
-                
-                if not contents:
-                    try:
-                        # Try to remove the directory and its contents
-                        shutil.rmtree(dir_path)
-                        logger.info(f"Removed directory with only system files: {dir_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to remove directory {dir_path}: {e}")
-            except Exception as e:
-                logger.warning(f"Failed to process directory {dir_path}: {e}")
-
-def process_directory(source_dir: str) -> None:
+    for dir_path in sorted(candidates, key=lambda d: d.count(os.sep), reverse=True):
+        try:
+            # Stop at the first entry that is not a system file
+            with os.scandir(dir_path) as it:
+                is_empty = not any(not _is_system_file(entry.name) for entry in it)
+            
+            if is_empty:
+                try:
+                    # Try to remove the directory and its contents
+                    shutil.rmtree(dir_path)
+                    logger.info(f"Removed directory with only system files: {dir_path}")
+                except Exception as e:
+                    logger.warning(f"Failed to remove directory {dir_path}: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to process directory {dir_path}: {e}")
+
+def scan_files(path: str, visited: Optional[List[str]] = None) -> Iterator[Tuple[os.DirEntry, str]]:
+    """
+    Recursively yield the files below a directory using os.scandir, so that
+    file types come from the cached directory entries instead of extra stat calls.
+    Synology @eaDir folders are not descended into, unreadable directories are
+    skipped with a warning.
+
+    Args:
+        path: Directory to scan
+        visited: Optional list that every scanned directory is appended to
+
+    Yields:
+        Tuple of (directory entry, parent directory path) for every file
+    """
+    try:
+        it = os.scandir(path)
+    except OSError as e:
+        logger.warning(f"Failed to scan directory {path}: {e}")
+        return
+
+    if visited is not None:
+        visited.append(path)
+    with it:
+        subdirs = []
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDE_DIRS:
+                    subdirs.append(entry.path)
+            elif entry.is_file():
+                yield entry, path
+
+    for subdir in subdirs:
+        yield from scan_files(subdir, visited)
+
+@contextlib.contextmanager
+def queued_logging() -> Iterator[multiprocessing.Queue]:
+    """
+    Route root logger records through a queue that a background QueueListener
+    thread drains into the configured handlers. Nested uses reuse the active queue.
+
+    Yields:
+        Queue that pool workers should log to
+    """
+    for handler in logger.handlers:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            yield handler.queue
+            return
+
+    log_queue = _MP_CONTEXT.Queue(-1)
+    handlers = logger.handlers
+    listener = logging.handlers.QueueListener(log_queue, *handlers,
+                                              respect_handler_level=True)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        listener.stop()
+        logger.handlers = handlers
+
+def _init_worker(log_queue: multiprocessing.Queue) -> None:
+    """
+    Initialize a pool worker so that its log records are sent to the main process
+    instead of being written to the inherited handlers.
+
+    Args:
+        log_queue: Queue consumed by the QueueListener in the main process
+    """
+    worker_logger = logging.getLogger()
+    worker_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+
+def _date_worker(batch: List[Tuple[str, os.stat_result, str]]) -> List[Tuple[Tuple[str, os.stat_result, str], Optional[datetime]]]:
+    """
+    Pool worker wrapping get_date_taken for a batch of files.
+    Headers are read by a thread pool so that several reads are in flight
+    while the already fetched headers are parsed.
+
+    Args:
+        batch: List of (path, stat result, parent directory) tuples
+
+    Returns:
+        List of (item, date taken) tuples
+    """
+    with ThreadPoolExecutor(max_workers=HEADER_READ_THREADS) as executor:
+        headers = executor.map(_prefetch_header,
+                               [item[0] for item in batch],
+                               [item[1] for item in batch])
+        return [(item, get_date_taken(item[0], item[1], header))
+                for item, header in zip(batch, headers)]
+
+def _date_folder(date_taken: datetime) -> str:
+    """
+    Get the year/month/day destination folder for a date.
+
+    Args:
+        date_taken: Date the file was taken
+
+    Returns:
+        Destination directory path
+    """
+    key = date_taken.toordinal()
+    dest_folder = _date_folders.get(key)
+    if dest_folder is None:
+        year = f"{date_taken.year:04d}"
+        month = f"{year}-{date_taken.month:02d}"
+        dest_folder = os.path.join(PHOTOS_BASE,
+                                   year,
+                                   month,
+                                   f"{month}-{date_taken.day:02d}")
+        _date_folders[key] = dest_folder
+    return dest_folder
+
+def _move_to_date_folder(path: str, date_taken: Optional[datetime], same_device: bool = False) -> bool:
+    """
+    Move a file into the year/month/day folder for its date.
+
+    Args:
+        path: Path to the media file
+        date_taken: Date the file was taken
+        same_device: Whether the file is on the same filesystem as PHOTOS_BASE
+
+    Returns:
+        True if the file was moved
+    """
+    if not date_taken:
+        logger.warning(f"No date found, file skipped: {path}")
+        return False
+
+    move_file(path, _date_folder(date_taken), same_device)
+    return True
+
+def _extract_dates(work: List[Tuple[str, os.stat_result, str]]) -> Iterator[Tuple[Tuple[str, os.stat_result, str], Optional[datetime]]]:
+    """
+    Extract the dates of files, using a process pool for runs of at least
+    POOL_THRESHOLD files and the calling process otherwise.
+
+    Args:
+        work: List of (path, stat result, parent directory) tuples
+
+    Yields:
+        Tuple of (item, date taken) for every file, in no particular order
+    """
+    batches = [work[i:i + DATE_BATCH_SIZE] for i in range(0, len(work), DATE_BATCH_SIZE)]
+    if len(work) < POOL_THRESHOLD:
+        for batch in batches:
+            yield from _date_worker(batch)
+        return
+
+    with queued_logging() as log_queue:
+        with _MP_CONTEXT.Pool(processes=os.cpu_count(),
+                              initializer=_init_worker,
+                              initargs=(log_queue,)) as pool:
+            for results in pool.imap_unordered(_date_worker, batches):
+                yield from results
+
+def _move_worker(moves: queue.Queue, same_device: bool, remaining: Dict[str, int],
+                 moved_paths: Set[str]) -> None:
+    """
+    Mover thread: move dated files until a None sentinel is received.
+
+    Args:
+        moves: Queue of (path, parent directory, date taken) tuples
+        same_device: Whether the files are on the same filesystem as PHOTOS_BASE
+        remaining: Per directory file counts, decremented for every moved file
+        moved_paths: Set that the source path of every moved file is added to
+    """
+    while True:
+        item = moves.get()
+        if item is None:
+            return
+        path, parent, date_taken = item
+        try:
+            if _move_to_date_folder(path, date_taken, same_device):
+                remaining[parent] -= 1
+                moved_paths.add(path)
+        except Exception as e:
+            logger.error(f"Failed to move {path}: {e}")
+
+def _put_move(moves: queue.Queue, mover: threading.Thread, item) -> None:
+    """
+    Put an item on the move queue without blocking forever on a dead mover thread.
+
+    Args:
+        moves: Queue consumed by the mover thread
+        mover: The mover thread
+        item: Item to put on the queue
+    """
+    while True:
+        try:
+            moves.put(item, timeout=MOVE_PUT_TIMEOUT)
+            return
+        except queue.Full:
+            if not mover.is_alive():
+                raise RuntimeError("Mover thread stopped unexpectedly")
+
+def process_directory(source_dir: str, cache: Optional[sqlite3.Connection] = None) -> None:
     """
     Process a single source directory, organizing its photos/videos.
+    Dates are extracted by the calling thread (in parallel by a process pool
+    for large runs) while a mover thread moves the already dated files.
 
     Args:
         source_dir: Source directory to process
+        cache: Optional date cache returned by open_date_cache. Moved files are never
+            scanned again, so only dates of files left in place are kept in it
     """
-    for root, dirs, files in os.walk(source_dir):
-        # Remove Synology @eaDir folders from the search list
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-        
-        for file in files:
-            ext = file.lower().split('.')[-1]
-            path = os.path.join(root, file)
-
-            if ext in MEDIA_EXTS:
-                date_taken = get_date_taken(path)
-                if not date_taken:
-                    logger.warning(f"No date found, file skipped: {path}")
-                    continue
-
-                year = date_taken.strftime('%Y')
-                month = date_taken.strftime('%Y-%m')
-                day = date_taken.strftime('%Y-%m-%d')
-
-                dest_folder = os.path.join(PHOTOS_BASE,
-                                         year,
-                                         month,
-                                         day)
-
-                move_file(path, dest_folder)
-            else:
-                logger.info(f"Skipped file with unknown extension: {path}")
+    try:
+        same_device = os.stat(source_dir).st_dev == os.stat(PHOTOS_BASE).st_dev
+    except OSError:
+        same_device = False
+
+    cached = []
+    work = []
+    dated = []
+    visited = []
+    # Number of files per directory that keep it from being removed
+    remaining: Dict[str, int] = {}
+    # Only build the skipped file messages if they are logged
+    log_skipped = logger.isEnabledFor(logging.INFO)
+    for entry, parent in scan_files(source_dir, visited):
+        is_media = entry.name.lower().endswith(_MEDIA_SUFFIXES)
+        # Media files are always counted, even with a system file name, since
+        # every moved file is subtracted again
+        if is_media or not _is_system_file(entry.name):
+            remaining[parent] = remaining.get(parent, 0) + 1
+
+        if not is_media:
+            if log_skipped:
+                logger.info(f"Skipped file with unknown extension: {entry.path}")
+            continue
+
+        st = entry.stat()
+        date_taken = get_cached_date(cache, st) if cache else None
+        if date_taken:
+            cached.append((entry.path, st, parent, date_taken))
+        else:
+            # Directory entries cannot be pickled, pass the stat result along instead
+            work.append((entry.path, st, parent))
+
+    moves = queue.Queue(maxsize=MOVE_QUEUE_SIZE)
+    moved_paths: Set[str] = set()
+    mover = threading.Thread(target=_move_worker, args=(moves, same_device, remaining, moved_paths))
+    mover.start()
+    try:
+        for path, st, parent, date_taken in cached:
+            _put_move(moves, mover, (path, parent, date_taken))
+
+        for (path, st, parent), date_taken in _extract_dates(work):
+            if date_taken and cache:
+                dated.append((path, st, date_taken))
+            _put_move(moves, mover, (path, parent, date_taken))
+    finally:
+        if mover.is_alive():
+            _put_move(moves, mover, None)
+        mover.join()
+        if cache:
+            for path, st, parent, date_taken in cached:
+                if path in moved_paths:
+                    delete_cached_date(cache, st)
+            for path, st, date_taken in dated:
+                if path not in moved_paths:
+                    store_cached_date(cache, st, date_taken)
+            cache.commit()
     
-    # Clean up empty directories after processing
-    remove_empty_dirs(source_dir)
+    # Clean up directories whose files have all been moved
+    remove_empty_dirs(d for d in visited if d != source_dir and not remaining.get(d))
 
 def main() -> None:
     """
     Main function that walks through all source folders and organizes photos/videos
     into date-based directory structure.
     """
-    for source_folder in SOURCE_FOLDERS:
-        if os.path.exists(source_folder):
-            logger.info(f"Processing directory: {source_folder}")
-            process_directory(source_folder)
-        else:
-            logger.warning(f"Source folder does not exist: {source_folder}")
+    setup_logging()
+
+    try:
+        cache = open_date_cache()
+    except Exception as e:
+        logger.warning(f"Failed to open date cache {CACHE_FILE}: {e}")
+        cache = None
+
+    try:
+        with queued_logging():
+            for source_folder in SOURCE_FOLDERS:
+                if os.path.exists(source_folder):
+                    logger.info(f"Processing directory: {source_folder}")
+                    process_directory(source_folder, cache)
+                else:
+                    logger.warning(f"Source folder does not exist: {source_folder}")
+    finally:
+        if cache:
+            cache.close()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,11 @@
+import errno
 import os
+import struct
+from datetime import datetime
 import pytest
-from photo_sorter import get_date_taken, MEDIA_EXTS
+import photo_sorter
+from photo_sorter import (get_date_taken, MEDIA_EXTS, open_date_cache, get_cached_date,
+                          store_cached_date, move_file, process_directory, _fast_datetime)
 
 def test_media_extensions():
     """Test that media extensions are properly defined"""
@@ -12,4 +17,136 @@ def test_media_extensions():
 def test_get_date_taken_with_invalid_file():
     """Test handling of invalid files in get_date_taken"""
     result = get_date_taken("nonexistent_file.jpg")
-    assert result is None 
\ No newline at end of file
+    assert result is None 
+
+def test_date_cache_roundtrip(tmp_path):
+    """Test that cached dates are returned only for unchanged files"""
+    media = tmp_path / "photo.jpg"
+    media.write_bytes(b"data")
+    cache = open_date_cache(str(tmp_path / "cache" / "exif.sqlite3"))
+    st = os.stat(media)
+    assert get_cached_date(cache, st) is None
+
+    store_cached_date(cache, st, datetime(2020, 5, 6, 7, 8, 9))
+    assert get_cached_date(cache, st) == datetime(2020, 5, 6, 7, 8, 9)
+
+    media.write_bytes(b"changed data")
+    assert get_cached_date(cache, os.stat(media)) is None
+    cache.close()
+
+def test_move_file_name_conflict(tmp_path):
+    """Test that move_file adds a counter instead of overwriting existing files"""
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    (dest / "IMG_0001.jpg").write_bytes(b"first")
+    (dest / "IMG_0001_1.jpg").write_bytes(b"second")
+    src = tmp_path / "IMG_0001.jpg"
+    src.write_bytes(b"third")
+
+    move_file(str(src), str(dest))
+
+    assert not src.exists()
+    assert (dest / "IMG_0001.jpg").read_bytes() == b"first"
+    assert (dest / "IMG_0001_1.jpg").read_bytes() == b"second"
+    assert (dest / "IMG_0001_2.jpg").read_bytes() == b"third"
+
+def _exif_jpeg(date_taken: bytes, endian: str = '<') -> bytes:
+    """Build a minimal JPEG containing only an EXIF DateTimeOriginal tag"""
+    exif_ifd_offset = 8 + 2 + 12 + 4
+    data_offset = exif_ifd_offset + 2 + 12 + 4
+    tiff = ((b'II' if endian == '<' else b'MM') + struct.pack(endian + 'HI', 42, 8)
+            + struct.pack(endian + 'HHHIII', 1, 0x8769, 4, 1, exif_ifd_offset, 0)
+            + struct.pack(endian + 'HHHIII', 1, 0x9003, 2, 20, data_offset, 0)
+            + date_taken + b'\0')
+    app1 = b'Exif\0\0' + tiff
+    return b'\xff\xd8\xff\xe1' + struct.pack('>H', len(app1) + 2) + app1 + b'\xff\xd9'
+
+@pytest.mark.parametrize('endian', ['<', '>'])
+def test_fast_datetime(endian):
+    """Test reading DateTimeOriginal from a JPEG header"""
+    buf = _exif_jpeg(b'2019:07:04 12:34:56', endian)
+    assert _fast_datetime(buf) == datetime(2019, 7, 4, 12, 34, 56)
+    assert _fast_datetime(_exif_jpeg(b'    :  :     :  :  ', endian)) is None
+    assert _fast_datetime(buf[:40]) is None
+    assert _fast_datetime(b'\x00\x00\x00\x18ftypheic') is None
+
+def test_move_file_duplicate(tmp_path):
+    """Test that move_file deletes the source if an identical file already exists"""
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    (dest / "IMG_0001.jpg").write_bytes(b"other")
+    (dest / "IMG_0001_1.jpg").write_bytes(b"photo")
+    src = tmp_path / "IMG_0001.jpg"
+    src.write_bytes(b"photo")
+
+    move_file(str(src), str(dest))
+
+    assert not src.exists()
+    assert sorted(p.name for p in dest.iterdir()) == ["IMG_0001.jpg", "IMG_0001_1.jpg"]
+
+def test_move_file_cross_device(tmp_path, monkeypatch):
+    """Test that move_file falls back to copying when a rename crosses filesystems"""
+    def replace(src, dst):
+        raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+    monkeypatch.setattr(os, 'replace', replace)
+    dest = tmp_path / "dest"
+    src = tmp_path / "IMG_0001.jpg"
+    src.write_bytes(b"photo")
+
+    move_file(str(src), str(dest), same_device=True)
+
+    assert not src.exists()
+    assert (dest / "IMG_0001.jpg").read_bytes() == b"photo"
+
+@pytest.mark.parametrize('name, data', [
+    ('photo.jpg', _exif_jpeg(b'2019:07:04 12:34:56')),
+    ('photo.NEF', _exif_jpeg(b'2019:07:04 12:34:56', '>')[12:-2]),
+])
+def test_get_date_taken_from_exif(tmp_path, name, data):
+    """Test that get_date_taken prefers the EXIF date over the modification time"""
+    media = tmp_path / name
+    media.write_bytes(data + b'\0' * 256)
+    assert get_date_taken(str(media)) == datetime(2019, 7, 4, 12, 34, 56)
+
+@pytest.mark.parametrize('pool_threshold', [photo_sorter.POOL_THRESHOLD, 0])
+def test_process_directory(tmp_path, monkeypatch, pool_threshold):
+    """Test sorting a source tree into date folders and cleaning it up"""
+    photos = tmp_path / "Photos"
+    monkeypatch.setattr(photo_sorter, 'PHOTOS_BASE', str(photos))
+    monkeypatch.setattr(photo_sorter, 'POOL_THRESHOLD', pool_threshold)
+    monkeypatch.setattr(photo_sorter, '_date_folders', {})
+    monkeypatch.setattr(photo_sorter, '_created_dirs', set())
+
+    source = tmp_path / "MobileBackup"
+    (source / "a" / "b").mkdir(parents=True)
+    (source / "a" / "b" / "IMG_0001.jpg").write_bytes(_exif_jpeg(b'2019:07:04 12:34:56') + b'\0' * 256)
+    (source / "a" / ".DS_Store").write_bytes(b"")
+    (source / "keep").mkdir()
+    (source / "keep" / "IMG_0002.jpg").write_bytes(_exif_jpeg(b'2019:07:05 08:00:00') + b'\0' * 256)
+    (source / "keep" / "notes.txt").write_text("notes")
+
+    process_directory(str(source))
+
+    assert (photos / "2019" / "2019-07" / "2019-07-04" / "IMG_0001.jpg").exists()
+    assert (photos / "2019" / "2019-07" / "2019-07-05" / "IMG_0002.jpg").exists()
+    assert not (source / "a").exists()
+    assert sorted(p.name for p in (source / "keep").iterdir()) == ["notes.txt"]
+    assert source.exists()
+
+def test_process_directory_trailing_slash(tmp_path, monkeypatch):
+    """Test a source path with a trailing slash and more files than the move queue holds"""
+    photos = tmp_path / "Photos"
+    monkeypatch.setattr(photo_sorter, 'PHOTOS_BASE', str(photos))
+    monkeypatch.setattr(photo_sorter, '_date_folders', {})
+    monkeypatch.setattr(photo_sorter, '_created_dirs', set())
+
+    source = tmp_path / "MobileBackup"
+    source.mkdir()
+    count = photo_sorter.MOVE_QUEUE_SIZE * 3
+    for i in range(count):
+        (source / f"IMG_{i:04d}.jpg").write_bytes(_exif_jpeg(b'2019:07:04 12:34:56') + b'\0' * 256)
+
+    process_directory(str(source) + os.sep)
+
+    assert len(list((photos / "2019" / "2019-07" / "2019-07-04").iterdir())) == count
+    assert list(source.iterdir()) == []